@@ -2,10 +2,25 @@
 OSHA Monitor - A comprehensive interface for OSHA regulatory updates
 """
 
+import io
+import threading
+from collections import defaultdict
+from cachetools import LRUCache, TTLCache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from flask import Flask, render_template, request
 import requests
-import xml.etree.ElementTree as ET
+from requests.adapters import HTTPAdapter
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+try:
+    import orjson as json
+except ImportError:
+    import json
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 from dateutil import parser as date_parser
 
 app = Flask(__name__)
@@ -15,32 +30,193 @@ FEDERAL_REGISTER_API = "https://www.federalregister.gov/api/v1/documents.json"
 OSHA_INTERPRETATIONS_RSS = "https://www.osha.gov/laws-regs/standardinterpretations.xml"
 OSHA_DIRECTIVES_RSS = "https://www.osha.gov/enforcement/directives.xml"
 
-
-def format_time_ago(pub_date):
+# Query parameters shared by every Federal Register request, built once as
+# (key, value) pairs so requests can encode them without expanding a dict
+FEDERAL_REGISTER_BASE_PARAMS = [
+    ("conditions[agencies][]", "occupational-safety-and-health-administration"),
+    ("fields[]", "title"),
+    ("fields[]", "type"),
+    ("fields[]", "abstract"),
+    ("fields[]", "publication_date"),
+    ("fields[]", "effective_on"),
+    ("fields[]", "html_url"),
+    ("fields[]", "pdf_url"),
+    ("order", "newest"),
+]
+
+# Shared HTTP session so connections to each host are kept alive and reused.
+# requests advertises brotli in Accept-Encoding (and decodes it) whenever the
+# brotli package is installed, falling back to gzip/deflate otherwise.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Federal Register document types requested for each content filter
+FEDERAL_REGISTER_TYPES = {
+    "all": ["RULE", "PRORULE", "NOTICE"],
+    "rules": ["RULE"],
+    "proposed": ["PRORULE"],
+    "notices": ["NOTICE"],
+}
+
+# Page sections in display order, keyed by document content type
+SECTIONS = {
+    "Rule": {
+        "heading": "Final Rules",
+        "description": "Enforceable regulations. Check effective dates for compliance deadlines.",
+        "tag_class": "tag-rule",
+        "tag_label": "Rule",
+        "show_effective": True,
+    },
+    "Proposed Rule": {
+        "heading": "Proposed Rules",
+        "description": "Not yet enforceable. These may be open for public comment.",
+        "tag_class": "tag-proposed",
+        "tag_label": "Proposed",
+        "show_effective": False,
+    },
+    "Interpretation": {
+        "heading": "Letters of Interpretation",
+        "description": "Official OSHA guidance on how standards apply to specific situations.",
+        "tag_class": "tag-interpretation",
+        "tag_label": "Interpretation",
+        "show_effective": False,
+    },
+    "Directive": {
+        "heading": "Directives",
+        "description": "Enforcement policies, national emphasis programs, and compliance procedures.",
+        "tag_class": "tag-directive",
+        "tag_label": "Directive",
+        "show_effective": False,
+    },
+    "Notice": {
+        "heading": "Notices",
+        "description": "Informational notices and announcements.",
+        "tag_class": "tag-notice",
+        "tag_label": "Notice",
+        "show_effective": False,
+    },
+}
+
+# Upstream responses are cached for an hour - sources update daily at most
+CACHE_TTL_SECONDS = 3600
+_feed_cache = TTLCache(maxsize=32, ttl=CACHE_TTL_SECONDS)
+_feed_cache_lock = threading.Lock()
+
+
+def cache_get(key):
+    """Return a cached upstream result, or None if missing or expired."""
+    with _feed_cache_lock:
+        return _feed_cache.get(key)
+
+
+def cache_set(key, value):
+    """Store a successful upstream result."""
+    with _feed_cache_lock:
+        _feed_cache[key] = value
+
+
+# Last ETag/Last-Modified seen per RSS feed and year filter, with the documents
+# parsed from that response, so expired cache entries can be revalidated with a 304
+_feed_validators = LRUCache(maxsize=32)
+
+
+def conditional_headers(key):
+    """Build If-None-Match/If-Modified-Since headers for a previously seen feed."""
+    with _feed_cache_lock:
+        validators = _feed_validators.get(key)
+    if validators is None:
+        return {}, None
+
+    etag, last_modified, documents = validators
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers, documents
+
+
+def remember_validators(key, response, documents):
+    """Store a feed response's validators alongside its parsed documents."""
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        with _feed_cache_lock:
+            _feed_validators[key] = (etag, last_modified, documents)
+
+
+@dataclass(slots=True)
+class Document:
+    """A single regulatory update from any source, as shown on the page."""
+    title: str
+    abstract: str
+    url: str
+    pdf_url: str
+    source: str
+    content_type: str
+    pub_date: datetime | None = None
+    pub_date_formatted: str = ""
+    time_ago: str = ""
+    effective_status: str = ""
+
+
+MONTH_ABBREVIATIONS = (
+    "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+    "Jul", "Aug", "Sep", "Oct", "Nov", "Dec",
+)
+
+
+def format_time_ago(pub_date, now=None):
     """Convert a datetime to a human-readable 'time ago' string."""
-    try:
-        # Handle timezone-aware dates
-        if pub_date.tzinfo is not None:
-            pub_date = pub_date.replace(tzinfo=None)
-        days_ago = (datetime.now() - pub_date).days
-        if days_ago < 0:
-            return "Upcoming"
-        elif days_ago == 0:
-            return "Today"
-        elif days_ago == 1:
-            return "Yesterday"
-        elif days_ago < 7:
-            return f"{days_ago} days ago"
-        elif days_ago < 30:
-            weeks = days_ago // 7
-            return f"{weeks} week{'s' if weeks > 1 else ''} ago"
-        elif days_ago < 365:
-            months = days_ago // 30
-            return f"{months} month{'s' if months > 1 else ''} ago"
-        else:
-            return pub_date.strftime("%b %Y")
-    except:
+    if pub_date is None:
         return ""
+    if now is None:
+        now = datetime.now()
+
+    # Handle timezone-aware dates
+    if pub_date.tzinfo is not None:
+        pub_date = pub_date.replace(tzinfo=None)
+
+    days_ago = (now - pub_date).days
+    if days_ago < 0:
+        return "Upcoming"
+    elif days_ago == 0:
+        return "Today"
+    elif days_ago == 1:
+        return "Yesterday"
+    elif days_ago < 7:
+        return f"{days_ago} days ago"
+    elif days_ago < 30:
+        weeks = days_ago // 7
+        return f"{weeks} week{'s' if weeks > 1 else ''} ago"
+    elif days_ago < 365:
+        months = days_ago // 30
+        return f"{months} month{'s' if months > 1 else ''} ago"
+    else:
+        return f"{MONTH_ABBREVIATIONS[pub_date.month - 1]} {pub_date.year}"
+
+
+def to_naive(value):
+    """Drop timezone info so all stored dates compare against each other."""
+    if value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return value
+
+
+def parse_iso_date(value):
+    """Parse a Federal Register YYYY-MM-DD date as a naive datetime, falling back to dateutil."""
+    try:
+        return to_naive(datetime.fromisoformat(value))
+    except ValueError:
+        return to_naive(date_parser.parse(value))
+
+
+def parse_rss_date(value):
+    """Parse an RFC 2822 RSS pubDate as a naive datetime, falling back to dateutil."""
+    try:
+        return to_naive(parsedate_to_datetime(value))
+    except (TypeError, ValueError):
+        return to_naive(date_parser.parse(value))
 
 
 def fetch_federal_register(year=None, doc_types=None, limit=30):
@@ -48,130 +224,135 @@ def fetch_federal_register(year=None, doc_types=None, limit=30):
     if doc_types is None:
         doc_types = ["RULE", "PRORULE", "NOTICE"]
 
-    params = {
-        "conditions[agencies][]": "occupational-safety-and-health-administration",
-        "conditions[type][]": doc_types,
-        "fields[]": [
-            "title",
-            "type",
-            "abstract",
-            "publication_date",
-            "effective_on",
-            "html_url",
-            "document_number",
-            "pdf_url"
-        ],
-        "per_page": limit,
-        "order": "newest"
-    }
-
+    year_int = None
     if year and year != "all":
         try:
-            params["conditions[publication_date][year]"] = int(year)
+            year_int = int(year)
         except (ValueError, TypeError):
             pass
 
+    cache_key = ("federal_register", year_int, tuple(doc_types), limit)
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    params = FEDERAL_REGISTER_BASE_PARAMS + [("conditions[type][]", t) for t in doc_types]
+    params.append(("per_page", limit))
+    if year_int is not None:
+        params.append(("conditions[publication_date][year]", year_int))
+
     try:
-        response = requests.get(FEDERAL_REGISTER_API, params=params, timeout=15)
+        response = SESSION.get(FEDERAL_REGISTER_API, params=params, timeout=15)
         response.raise_for_status()
-        data = response.json()
+        data = json.loads(response.content)
 
+        now = datetime.now()
         documents = []
         for doc in data.get("results", []):
-            processed = {
-                "title": doc.get("title", ""),
-                "abstract": doc.get("abstract", ""),
-                "url": doc.get("html_url", ""),
-                "pdf_url": doc.get("pdf_url", ""),
-                "source": "Federal Register",
-                "content_type": doc.get("type", ""),
-            }
+            processed = Document(
+                title=doc.get("title", ""),
+                abstract=doc.get("abstract", ""),
+                url=doc.get("html_url", ""),
+                pdf_url=doc.get("pdf_url", ""),
+                source="Federal Register",
+                content_type=doc.get("type", ""),
+            )
 
             # Parse publication date
             if doc.get("publication_date"):
                 try:
-                    pub_date = date_parser.parse(doc["publication_date"])
-                    processed["pub_date"] = pub_date
-                    processed["pub_date_formatted"] = pub_date.strftime("%B %d, %Y")
-                    processed["time_ago"] = format_time_ago(pub_date)
+                    pub_date = parse_iso_date(doc["publication_date"])
+                    processed.pub_date_formatted = pub_date.strftime("%B %d, %Y")
+                    processed.pub_date = pub_date
                 except:
-                    processed["pub_date"] = None
-                    processed["pub_date_formatted"] = doc["publication_date"]
-                    processed["time_ago"] = ""
+                    processed.pub_date_formatted = doc["publication_date"]
 
             # Parse effective date
             if doc.get("effective_on"):
                 try:
-                    eff_date = date_parser.parse(doc["effective_on"])
-                    if eff_date > datetime.now():
-                        days_until = (eff_date - datetime.now()).days
+                    eff_date = parse_iso_date(doc["effective_on"])
+                    if eff_date > now:
+                        days_until = (eff_date - now).days
                         if days_until == 0:
-                            processed["effective_status"] = "Effective today"
+                            processed.effective_status = "Effective today"
                         elif days_until == 1:
-                            processed["effective_status"] = "Effective tomorrow"
+                            processed.effective_status = "Effective tomorrow"
                         elif days_until < 30:
-                            processed["effective_status"] = f"Effective in {days_until} days"
+                            processed.effective_status = f"Effective in {days_until} days"
                         else:
-                            processed["effective_status"] = f"Effective {eff_date.strftime('%b %d, %Y')}"
+                            processed.effective_status = f"Effective {eff_date.strftime('%b %d, %Y')}"
                     else:
-                        processed["effective_status"] = f"Effective since {eff_date.strftime('%b %d, %Y')}"
+                        processed.effective_status = f"Effective since {eff_date.strftime('%b %d, %Y')}"
                 except:
-                    processed["effective_status"] = ""
-            else:
-                processed["effective_status"] = ""
+                    pass
 
             documents.append(processed)
 
-        return documents, data.get("count", 0)
+        result = (documents, data.get("count", 0))
+        cache_set(cache_key, result)
+        return result
 
-    except requests.RequestException as e:
+    except (requests.RequestException, ValueError) as e:
         print(f"Error fetching Federal Register: {e}")
         return [], 0
 
 
-def fetch_osha_rss(url, content_type, source_name):
-    """Fetch and parse an OSHA RSS feed."""
+def fetch_osha_rss(url, content_type, source_name, year_filter=None):
+    """Fetch and parse an OSHA RSS feed, optionally keeping one year's items."""
+    cache_key = (url, year_filter)
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    headers, previous_documents = conditional_headers(cache_key)
+
     try:
-        response = requests.get(url, timeout=15)
+        response = SESSION.get(url, headers=headers, timeout=15)
+
+        # Feed unchanged since the last download - reuse what we parsed then
+        if response.status_code == 304 and previous_documents is not None:
+            cache_set(cache_key, previous_documents)
+            return previous_documents
+
         response.raise_for_status()
 
-        root = ET.fromstring(response.content)
         documents = []
 
-        for item in root.findall(".//item"):
-            title = item.findtext("title", "").strip()
-            link = item.findtext("link", "").strip()
-            description = item.findtext("description", "").strip()
-            pub_date_str = item.findtext("pubDate", "").strip()
-
-            processed = {
-                "title": title,
-                "abstract": description,
-                "url": link,
-                "pdf_url": "",
-                "source": source_name,
-                "content_type": content_type,
-                "effective_status": "",
-            }
+        # Stream items instead of building the whole tree up front
+        for _, item in ET.iterparse(io.BytesIO(response.content), events=("end",)):
+            if item.tag != "item":
+                continue
 
             # Parse publication date
+            pub_date = None
+            pub_date_str = item.findtext("pubDate", "").strip()
             if pub_date_str:
                 try:
-                    pub_date = date_parser.parse(pub_date_str)
-                    processed["pub_date"] = pub_date
-                    processed["pub_date_formatted"] = pub_date.strftime("%B %d, %Y")
-                    processed["time_ago"] = format_time_ago(pub_date)
+                    pub_date = parse_rss_date(pub_date_str)
                 except:
-                    processed["pub_date"] = None
-                    processed["pub_date_formatted"] = ""
-                    processed["time_ago"] = ""
-            else:
-                processed["pub_date"] = None
-                processed["pub_date_formatted"] = ""
-                processed["time_ago"] = ""
-
-            documents.append(processed)
-
+                    pass
+
+            # Only build documents for items in the requested year
+            if year_filter is None or (pub_date and pub_date.year == year_filter):
+                documents.append(Document(
+                    title=item.findtext("title", "").strip(),
+                    abstract=item.findtext("description", "").strip(),
+                    url=item.findtext("link", "").strip(),
+                    pdf_url="",
+                    source=source_name,
+                    content_type=content_type,
+                    pub_date=pub_date,
+                    pub_date_formatted=pub_date.strftime("%B %d, %Y") if pub_date else "",
+                ))
+
+            # Free the processed item and, under lxml, its earlier siblings
+            item.clear()
+            if hasattr(item, "getprevious"):
+                while item.getprevious() is not None:
+                    del item.getparent()[0]
+
+        cache_set(cache_key, documents)
+        remember_validators(cache_key, response, documents)
         return documents
 
     except Exception as e:
@@ -179,21 +360,23 @@ def fetch_osha_rss(url, content_type, source_name):
         return []
 
 
-def fetch_interpretations():
+def fetch_interpretations(year_filter=None):
     """Fetch OSHA Letters of Interpretation."""
     return fetch_osha_rss(
         OSHA_INTERPRETATIONS_RSS,
         "Interpretation",
-        "OSHA Interpretations"
+        "OSHA Interpretations",
+        year_filter=year_filter
     )
 
 
-def fetch_directives():
+def fetch_directives(year_filter=None):
     """Fetch OSHA Directives."""
     return fetch_osha_rss(
         OSHA_DIRECTIVES_RSS,
         "Directive",
-        "OSHA Directives"
+        "OSHA Directives",
+        year_filter=year_filter
     )
 
 
@@ -201,97 +384,78 @@ def fetch_directives():
 def index():
     """Main page - show OSHA regulatory updates."""
 
+    now = datetime.now()
+
     # Get filters from query params
     content_filter = request.args.get("content", "rules")
-    year = request.args.get("year", str(datetime.now().year))
+    year = request.args.get("year", str(now.year))
 
-    # Fetch from all sources
+    # Parse the year once for filtering RSS items during ingestion
+    year_int = None
+    if year and year != "all":
+        try:
+            year_int = int(year)
+        except ValueError:
+            pass
+
+    # Fetch from all sources in parallel - each call is network-bound
     all_documents = []
     total_count = 0
 
-    # Federal Register content
-    if content_filter in ["all", "rules"]:
-        fr_docs, fr_count = fetch_federal_register(
-            year=year,
-            doc_types=["RULE"],
-            limit=30
-        )
-        all_documents.extend(fr_docs)
-        total_count += fr_count
-
-    if content_filter in ["all", "proposed"]:
-        prop_docs, prop_count = fetch_federal_register(
-            year=year,
-            doc_types=["PRORULE"],
-            limit=30
-        )
-        all_documents.extend(prop_docs)
-        total_count += prop_count
-
-    if content_filter in ["all", "notices"]:
-        notice_docs, notice_count = fetch_federal_register(
-            year=year,
-            doc_types=["NOTICE"],
-            limit=30
-        )
-        all_documents.extend(notice_docs)
-        total_count += notice_count
-
-    # OSHA website content (not filtered by year - RSS only has recent items)
-    if content_filter in ["all", "interpretations"]:
-        interp_docs = fetch_interpretations()
-        # Filter by year if specified
-        if year and year != "all":
-            try:
-                year_int = int(year)
-                interp_docs = [d for d in interp_docs if d.get("pub_date") and d["pub_date"].year == year_int]
-            except:
-                pass
-        all_documents.extend(interp_docs)
-        total_count += len(interp_docs)
-
-    if content_filter in ["all", "directives"]:
-        directive_docs = fetch_directives()
-        # Filter by year if specified
-        if year and year != "all":
-            try:
-                year_int = int(year)
-                directive_docs = [d for d in directive_docs if d.get("pub_date") and d["pub_date"].year == year_int]
-            except:
-                pass
-        all_documents.extend(directive_docs)
-        total_count += len(directive_docs)
-
-    # Sort all documents by date (newest first)
-    # Use a safe sort key that handles None and timezone-aware dates
-    def sort_key(doc):
-        pub_date = doc.get("pub_date")
-        if pub_date is None:
-            return datetime.min
-        # Convert to naive datetime for comparison if needed
-        if pub_date.tzinfo is not None:
-            return pub_date.replace(tzinfo=None)
-        return pub_date
-
-    all_documents.sort(key=sort_key, reverse=True)
-
-    # Group by content type for display
-    final_rules = [d for d in all_documents if d.get("content_type") == "Rule"]
-    proposed_rules = [d for d in all_documents if d.get("content_type") == "Proposed Rule"]
-    notices = [d for d in all_documents if d.get("content_type") == "Notice"]
-    interpretations = [d for d in all_documents if d.get("content_type") == "Interpretation"]
-    directives = [d for d in all_documents if d.get("content_type") == "Directive"]
-
-    today = datetime.now().strftime("%A, %B %d, %Y")
-    current_year = datetime.now().year
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = {}
+
+        # Federal Register content - all selected types in a single request
+        doc_types = FEDERAL_REGISTER_TYPES.get(content_filter)
+        if doc_types:
+            futures[executor.submit(
+                fetch_federal_register,
+                year=year,
+                doc_types=doc_types,
+                limit=30 * len(doc_types)
+            )] = "federal_register"
+
+        # OSHA website content (RSS only has recent items)
+        if content_filter in ["all", "interpretations"]:
+            futures[executor.submit(fetch_interpretations, year_filter=year_int)] = "rss"
+        if content_filter in ["all", "directives"]:
+            futures[executor.submit(fetch_directives, year_filter=year_int)] = "rss"
+
+        for future in as_completed(futures):
+            if futures[future] == "federal_register":
+                fr_docs, fr_count = future.result()
+                all_documents.extend(fr_docs)
+                total_count += fr_count
+            else:
+                rss_docs = future.result()
+                all_documents.extend(rss_docs)
+                total_count += len(rss_docs)
+
+    # Sort all documents by date (newest first). Dates are already naive from
+    # ingestion, so only missing dates need handling.
+    all_documents.sort(key=lambda d: d.pub_date or datetime.min, reverse=True)
+
+    # Group by content type for display in a single pass. Relative dates are
+    # filled in per request so cached documents stay current.
+    by_type = defaultdict(list)
+    for doc in all_documents:
+        doc.time_ago = format_time_ago(doc.pub_date, now=now)
+        by_type[doc.content_type].append(doc)
+
+    # Non-empty sections only, in display order
+    sections = {
+        content_type: by_type[content_type]
+        for content_type in SECTIONS
+        if by_type[content_type]
+    }
+
+    today = now.strftime("%A, %B %d, %Y")
+    current_year = now.year
 
     return render_template(
         "index.html",
-        final_rules=final_rules,
-        proposed_rules=proposed_rules,
-        notices=notices,
-        interpretations=interpretations,
-        directives=directives,
+        sections=sections,
+        section_info=SECTIONS,
         today=today,
         year=year,
         current_year=current_year,
@@ -3,10 +3,20 @@ Email digest for OSHA Monitor - sends daily alerts for new regulatory updates
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 import resend
 import requests
-import xml.etree.ElementTree as ET
+from requests.adapters import HTTPAdapter
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+try:
+    import orjson as json
+except ImportError:
+    import json
 from datetime import datetime, timedelta
+from html import escape
 from dateutil import parser as date_parser
 
 # Configuration from environment variables
@@ -19,6 +29,12 @@ FEDERAL_REGISTER_API = "https://www.federalregister.gov/api/v1/documents.json"
 OSHA_INTERPRETATIONS_RSS = "https://www.osha.gov/laws-regs/standardinterpretations.xml"
 OSHA_DIRECTIVES_RSS = "https://www.osha.gov/enforcement/directives.xml"
 
+# Shared HTTP session so connections to each host are kept alive and reused.
+# requests advertises brotli in Accept-Encoding (and decodes it) whenever the
+# brotli package is installed, falling back to gzip/deflate otherwise.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 
 def fetch_recent_federal_register(days=1):
     """Fetch OSHA documents from the Federal Register published in the last N days."""
@@ -37,9 +53,9 @@ def fetch_recent_federal_register(days=1):
     }
 
     try:
-        response = requests.get(FEDERAL_REGISTER_API, params=params, timeout=15)
+        response = SESSION.get(FEDERAL_REGISTER_API, params=params, timeout=15)
         response.raise_for_status()
-        data = response.json()
+        data = json.loads(response.content)
 
         documents = []
         for doc in data.get("results", []):
@@ -72,7 +88,7 @@ def fetch_recent_rss(url, content_type, days=1):
     cutoff_date = datetime.now() - timedelta(days=days)
 
     try:
-        response = requests.get(url, timeout=15)
+        response = SESSION.get(url, timeout=15)
         response.raise_for_status()
 
         root = ET.fromstring(response.content)
@@ -106,18 +122,20 @@ def fetch_recent_rss(url, content_type, days=1):
 def get_all_recent_documents(days=1):
     """Get all recent OSHA documents from all sources."""
 
-    documents = []
-
-    # Federal Register
-    documents.extend(fetch_recent_federal_register(days))
+    # Fetch all sources in parallel - each call is network-bound
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        fr_task = executor.submit(fetch_recent_federal_register, days)
+        interp_task = executor.submit(
+            fetch_recent_rss, OSHA_INTERPRETATIONS_RSS, "Interpretation", days
+        )
+        directives_task = executor.submit(
+            fetch_recent_rss, OSHA_DIRECTIVES_RSS, "Directive", days
+        )
 
-    # OSHA RSS feeds
-    documents.extend(fetch_recent_rss(
-        OSHA_INTERPRETATIONS_RSS, "Interpretation", days
-    ))
-    documents.extend(fetch_recent_rss(
-        OSHA_DIRECTIVES_RSS, "Directive", days
-    ))
+        documents = []
+        documents.extend(fr_task.result())
+        documents.extend(interp_task.result())
+        documents.extend(directives_task.result())
 
     return documents
 
@@ -146,7 +164,7 @@ def build_email_html(documents):
     interpretations = [d for d in documents if d["type"] == "Interpretation"]
     directives = [d for d in documents if d["type"] == "Directive"]
 
-    html = f"""
+    parts = [f"""
     <!DOCTYPE html>
     <html>
     <head>
@@ -160,45 +178,48 @@ def build_email_html(documents):
         <p style="background: #f0f7ff; padding: 12px 16px; border-radius: 6px; border-left: 4px solid #3182ce;">
             <strong>{len(documents)} new item{'s' if len(documents) != 1 else ''}</strong> published since yesterday
         </p>
-    """
+    """]
 
     def render_section(title, items, color):
         if not items:
             return ""
 
-        section = f"""
+        section = [f"""
         <h2 style="color: {color}; font-size: 18px; margin-top: 30px; margin-bottom: 15px; padding-bottom: 8px; border-bottom: 2px solid {color};">
             {title} ({len(items)})
         </h2>
-        """
+        """]
 
         for doc in items:
-            abstract = doc["abstract"][:300] + "..." if len(doc["abstract"]) > 300 else doc["abstract"]
+            abstract = doc["abstract"] or ""
+            if len(abstract) > 300:
+                abstract = f"{abstract[:300]}..."
+            effective = f" · Effective {escape(doc['effective_on'])}" if doc["effective_on"] else ""
 
-            section += f"""
+            section.append(f"""
             <div style="margin-bottom: 20px; padding-bottom: 20px; border-bottom: 1px solid #eee;">
-                <a href="{doc['url']}" style="color: #2c5282; text-decoration: none; font-weight: 600; font-size: 16px;">
-                    {doc['title']}
+                <a href="{escape(doc['url'])}" style="color: #2c5282; text-decoration: none; font-weight: 600; font-size: 16px;">
+                    {escape(doc['title'])}
                 </a>
                 <p style="color: #666; font-size: 14px; margin: 8px 0;">
-                    {abstract}
+                    {escape(abstract)}
                 </p>
                 <p style="font-size: 13px; color: #888; margin: 0;">
-                    Published {doc['pub_date']}
-                    {f" · Effective {doc['effective_on']}" if doc['effective_on'] else ""}
+                    Published {escape(doc['pub_date'])}
+                    {effective}
                 </p>
             </div>
-            """
+            """)
 
-        return section
+        return "".join(section)
 
-    html += render_section("Final Rules", final_rules, "#c53030")
-    html += render_section("Proposed Rules", proposed, "#dd6b20")
-    html += render_section("Letters of Interpretation", interpretations, "#2c7a7b")
-    html += render_section("Directives", directives, "#5a67d8")
-    html += render_section("Notices", notices, "#718096")
+    parts.append(render_section("Final Rules", final_rules, "#c53030"))
+    parts.append(render_section("Proposed Rules", proposed, "#dd6b20"))
+    parts.append(render_section("Letters of Interpretation", interpretations, "#2c7a7b"))
+    parts.append(render_section("Directives", directives, "#5a67d8"))
+    parts.append(render_section("Notices", notices, "#718096"))
 
-    html += f"""
+    parts.append("""
         <hr style="border: none; border-top: 1px solid #eee; margin: 30px 0;">
         <p style="font-size: 13px; color: #888; text-align: center;">
             <a href="https://osha-monitor.onrender.com" style="color: #3182ce;">View all updates</a> ·
@@ -206,9 +227,9 @@ def build_email_html(documents):
         </p>
     </body>
     </html>
-    """
+    """)
 
-    return html
+    return "".join(parts)
 
 
 def build_email_text(documents):